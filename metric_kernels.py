@@ -0,0 +1,53 @@
+"""
+Metric kernels for oom_metrics_analyzer.py
+
+The per-method / per-class number crunching (CC and LCOM), kept in its own fully
+type-annotated module so it can optionally be compiled to a C extension:
+
+    mypyc metric_kernels.py
+
+The resulting metric_kernels.*.so sits next to this file and is picked up by the
+normal import in place of the pure-Python version; without it nothing changes.
+
+"""
+import sys
+from typing import Dict, List, Set
+
+
+if sys.version_info >= (3, 10):
+    def _popcount(x: int) -> int:
+        return x.bit_count()
+else:
+    def _popcount(x: int) -> int:
+        return bin(x).count('1')
+
+
+def cyclomatic_complexity(decisions: int) -> int:
+    # CC = 1 + number of decision points inside function
+    # (if/for/while/try/with/except/boolop/ifexp, counted by Analyzer)
+    return max(1, 1 + decisions)
+
+
+# LCOM (Henderson-Sellers/Chidamber-Kemerer style simplified)
+def lcom_from_method_attrs(method_attrs: List[Set[str]]) -> int:
+    # method_attrs[i] = attributes used by method i ('self.X' in its body)
+    m = len(method_attrs)
+    if m <= 1:
+        return 0
+    # inverted index: attribute -> bitmask of the methods that use it
+    attr_methods: Dict[str, int] = {}
+    for i in range(m):
+        bit = 1 << i
+        for a in method_attrs[i]:
+            attr_methods[a] = attr_methods.get(a, 0) | bit
+    # Q = method pairs sharing at least one attribute, P = the disjoint rest
+    Q = 0
+    for i in range(m):
+        linked = 0
+        for a in method_attrs[i]:
+            linked |= attr_methods[a]
+        # only count partners j > i so each pair is seen once
+        Q += _popcount(linked >> (i + 1))
+    P = m * (m - 1) // 2 - Q
+    lcom = P - Q
+    return lcom if lcom > 0 else 0
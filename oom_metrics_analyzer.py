@@ -9,94 +9,229 @@ Notes / Limitations:
 - Works on Python source only (.py).
 - Best-effort static analysis using the ast module; may miss dynamic features (duck typing, dynamic imports, eval).
 - Halstead metrics are approximated by counting AST token types as operators/operands.
+- Files are read by a small thread pool and parsed/analyzed in parallel worker processes (one per CPU).
 
 """
 import os
 import sys
 import ast
 import math
-from collections import defaultdict, Counter
+import re
+from collections import defaultdict, deque, Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# CC / LCOM kernels; optionally mypyc-compiled (see metric_kernels.py)
+from metric_kernels import cyclomatic_complexity, lcom_from_method_attrs
 
 # ---------- Utilities ----------
 
 def iter_py_files(root):
-    for dirpath, _, filenames in os.walk(root):
-        for f in filenames:
-            if f.endswith('.py'):
-                yield os.path.join(dirpath, f)
+    # iterative os.scandir walk, yielding paths in the same top-down order as os.walk(root)
+    stack = [root]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        # like os.walk, don't descend into symlinked directories
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith('.py'):
+                        yield entry.path
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
 
 
 # ---------- AST Visitors ----------
 
+def _base_name(b):
+    # simple name of a base class expression, used to resolve it against project classes
+    if isinstance(b, ast.Name):
+        return b.id
+    if isinstance(b, ast.Attribute):
+        # e.g., module.Base
+        return b.attr
+    if isinstance(b, ast.Subscript):
+        # e.g., Generic[T] -> Generic
+        return _base_name(b.value)
+    if isinstance(b, ast.Call):
+        # e.g., with_metaclass(Meta, Base) -> with_metaclass
+        return _base_name(b.func)
+    return None
+
+
+class MethodInfo:
+    # what the metrics need from a method, gathered during the visit (no AST kept)
+    __slots__ = ('lineno', 'end_lineno', 'self_attrs', 'decisions')
+
+    def __init__(self, lineno, end_lineno):
+        self.lineno = lineno
+        self.end_lineno = end_lineno
+        self.self_attrs = set()  # self.<attr> names used, for LCOM
+        self.decisions = 0  # number of decision points, for CC
+
+
 class ClassInfo:
-    def __init__(self, name, node, filepath):
+    __slots__ = ('name', 'filepath', 'methods', 'attributes', 'bases', 'called_classes',
+                 'called_methods', 'overrides', 'wmc', 'lcom')
+
+    def __init__(self, name, filepath):
         self.name = name
-        self.node = node
         self.filepath = filepath
-        self.methods = {}  # name -> ast.FunctionDef
+        self.methods = {}  # name -> MethodInfo
         self.attributes = set()
         self.bases = []  # base class names (as strings)
         self.called_classes = set()  # for CBO
         self.called_methods = set()  # for RFC
         self.overrides = set()
+        # per-class metrics computed in the worker
+        self.wmc = 0
+        self.lcom = 0
 
 
-class Analyzer(ast.NodeVisitor):
+class FileResult:
+    # picklable per-file summary returned by worker processes (no AST nodes)
+    __slots__ = ('filepath', 'classes', 'operators', 'operands', 'error',
+                 'loc', 'comment_lines', 'total_lines')
+
+    def __init__(self, filepath, classes=None, operators=None, operands=None, error=None):
+        self.filepath = filepath
+        self.classes = classes if classes is not None else {}
+        self.operators = operators if operators is not None else {}
+        self.operands = operands if operands is not None else {}
+        self.error = error
+        # line counts for MI, gathered from the same read as the parse
+        self.loc = 0
+        self.comment_lines = 0
+        self.total_lines = 0
+
+
+class Analyzer:
+    # visit_<NodeType> handlers are dispatched by node type through _dispatch (built below)
     def __init__(self, filepath):
         self.filepath = filepath
         self.classes = {}  # name -> ClassInfo
         self.current_class = None
         self.current_method = None
-        # Halstead helpers
-        self.operators = Counter()
-        self.operands = Counter()
+        # MethodInfo of the methods being visited, innermost last
+        self._method_stack = []
+        # run()'s work stack: AST nodes still to visit, plus (callback, arg) entries
+        self._stack = None
+        # Halstead helpers: token -> count, plain dicts updated via .get() in the hot handlers
+        self.operators = {}
+        self.operands = {}
+        # call operators keyed by callee name; folded into operators as 'call.<name>' by run()
+        self.call_operators = {}
+
+    def run(self, tree):
+        # iterative depth-first walk over an explicit work stack: no Python recursion,
+        # so deeply nested (generated) code can't hit the recursion limit here
+        stack = self._stack = [tree]
+        pop = stack.pop
+        dispatch = self._dispatch
+        while stack:
+            node = pop()
+            if node.__class__ is tuple:
+                # scheduled by _after_children: the node's subtree is done
+                fn, arg = node
+                fn(arg)
+                continue
+            handler = dispatch.get(node.__class__)
+            if handler is None:
+                self.generic_visit(node)
+            else:
+                handler(self, node)
+        self._stack = None
+        operators = self.operators
+        for name, n in self.call_operators.items():
+            key = 'call.' + name
+            operators[key] = operators.get(key, 0) + n
+        self.call_operators.clear()
+
+    def generic_visit(self, node):
+        # schedule the children, pushed in reverse so run() pops them in source order
+        push = self._stack.append
+        for field in reversed(node._fields):
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in reversed(value):
+                    if isinstance(item, ast.AST):
+                        push(item)
+            elif isinstance(value, ast.AST):
+                push(value)
+
+    def _after_children(self, fn, arg):
+        # call fn(arg) once every node the following generic_visit schedules is visited
+        self._stack.append((fn, arg))
 
     def visit_ClassDef(self, node: ast.ClassDef):
-        ci = ClassInfo(node.name, node, self.filepath)
+        ci = ClassInfo(node.name, self.filepath)
         # bases
         for b in node.bases:
-            if isinstance(b, ast.Name):
-                ci.bases.append(b.id)
-            elif isinstance(b, ast.Attribute):
-                # e.g., module.Base
-                ci.bases.append(b.attr)
-            else:
-                ci.bases.append(ast.unparse(b) if hasattr(ast, 'unparse') else '?')
+            name = _base_name(b)
+            ci.bases.append(name if name is not None else '?')
         self.classes[node.name] = ci
         # traverse methods
-        prev_class = self.current_class
+        self._after_children(self._leave_class, self.current_class)
         self.current_class = ci
         self.generic_visit(node)
+
+    def _leave_class(self, prev_class):
         self.current_class = prev_class
 
     def visit_FunctionDef(self, node: ast.FunctionDef):
         if self.current_class is not None:
-            self.current_class.methods[node.name] = node
-            prev_method = self.current_method
+            ci = self.current_class
+            mi = MethodInfo(node.lineno, node.end_lineno)
+            ci.methods[node.name] = mi
+            self._method_stack.append(mi)
+            self._after_children(self._leave_method, self.current_method)
             self.current_method = node.name
             self.generic_visit(node)
-            self.current_method = prev_method
         else:
 
             # top-level function — still count for Halstead
-            prev_method = self.current_method
+            self._after_children(self._restore_method, self.current_method)
             self.current_method = None
             self.generic_visit(node)
-            self.current_method = prev_method
+
+    def _leave_method(self, prev_method):
+        self.current_method = prev_method
+        mi = self._method_stack.pop()
+        if self._method_stack:
+            # a nested def is also part of the enclosing method's body
+            outer = self._method_stack[-1]
+            outer.self_attrs |= mi.self_attrs
+            outer.decisions += mi.decisions
+
+    def _restore_method(self, prev_method):
+        self.current_method = prev_method
 
     def visit_Attribute(self, node: ast.Attribute):
         # attribute access like self.x or OtherClass.method
         # consider attribute as operand
-        self.operands[str(node.attr)] += 1
+        operands = self.operands
+        operands[node.attr] = operands.get(node.attr, 0) + 1
         # if attribute is class-name-like, consider for CBO
         if isinstance(node.value, ast.Name) and node.value.id != 'self':
             if self.current_class:
                 self.current_class.called_classes.add(node.value.id)
+        elif isinstance(node.value, ast.Name) and self._method_stack:
+            # self.X inside a method -> attribute used by that method (LCOM);
+            # the branch above already excluded every name other than 'self'
+            self._method_stack[-1].self_attrs.add(node.attr)
         self.generic_visit(node)
 
     def visit_Call(self, node: ast.Call):
         # function/method calls
         func = node.func
+        calls = self.call_operators
         if isinstance(func, ast.Attribute):
             # obj.method()
             if isinstance(func.value, ast.Name) and func.value.id == 'self':
@@ -106,17 +241,19 @@ class Analyzer(ast.NodeVisitor):
             else:
                 if self.current_class and isinstance(func.value, ast.Name):
                     self.current_class.called_classes.add(func.value.id)
-            self.operators['call.' + func.attr] += 1
+            calls[func.attr] = calls.get(func.attr, 0) + 1
         elif isinstance(func, ast.Name):
-            self.operators['call.' + func.id] += 1
+            calls[func.id] = calls.get(func.id, 0) + 1
         else:
-            self.operators['call.unknown'] += 1
+            calls['unknown'] = calls.get('unknown', 0) + 1
         # operands: args
+        operands = self.operands
         for a in node.args:
             if isinstance(a, ast.Constant):
-                self.operands[str(a.value)] += 1
+                k = str(a.value)
+                operands[k] = operands.get(k, 0) + 1
             elif isinstance(a, ast.Name):
-                self.operands[a.id] += 1
+                operands[a.id] = operands.get(a.id, 0) + 1
         self.generic_visit(node)
 
     def visit_Assign(self, node: ast.Assign):
@@ -127,55 +264,99 @@ class Analyzer(ast.NodeVisitor):
                 if self.current_class:
                     self.current_class.attributes.add(t.attr)
             elif isinstance(t, ast.Name):
-                self.operands[t.id] += 1
+                operands = self.operands
+                operands[t.id] = operands.get(t.id, 0) + 1
         self.generic_visit(node)
 
     def visit_Name(self, node: ast.Name):
         # operator/operand heuristic
         if isinstance(node.ctx, ast.Load):
-            self.operands[node.id] += 1
+            operands = self.operands
+            operands[node.id] = operands.get(node.id, 0) + 1
         self.generic_visit(node)
 
     def visit_If(self, node: ast.If):
-        self.operators['if'] += 1
+        operators = self.operators
+        operators['if'] = operators.get('if', 0) + 1
+        self._count_decision()
         self.generic_visit(node)
 
     def visit_For(self, node: ast.For):
-        self.operators['for'] += 1
+        operators = self.operators
+        operators['for'] = operators.get('for', 0) + 1
+        self._count_decision()
         self.generic_visit(node)
 
     def visit_While(self, node: ast.While):
-        self.operators['while'] += 1
+        operators = self.operators
+        operators['while'] = operators.get('while', 0) + 1
+        self._count_decision()
         self.generic_visit(node)
 
     def visit_Try(self, node: ast.Try):
-        self.operators['try'] += 1
+        operators = self.operators
+        operators['try'] = operators.get('try', 0) + 1
+        self._count_decision()
         self.generic_visit(node)
 
     def visit_BoolOp(self, node: ast.BoolOp):
         # and/or
-        self.operators['boolop'] += 1
+        operators = self.operators
+        operators['boolop'] = operators.get('boolop', 0) + 1
+        self._count_decision()
+        self.generic_visit(node)
+
+    # decision points that only feed CC, not Halstead
+    def visit_With(self, node: ast.With):
+        self._count_decision()
+        self.generic_visit(node)
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler):
+        self._count_decision()
+        self.generic_visit(node)
+
+    def visit_IfExp(self, node: ast.IfExp):
+        self._count_decision()
+        self.generic_visit(node)
+
+    def visit_Expr(self, node: ast.Expr):
+        # bare string statements (docstrings) hold nothing any metric counts
+        value = node.value
+        if isinstance(value, ast.Constant) and isinstance(value.value, str):
+            return
         self.generic_visit(node)
 
     def visit_Return(self, node: ast.Return):
-        self.operators['return'] += 1
+        operators = self.operators
+        operators['return'] = operators.get('return', 0) + 1
         self.generic_visit(node)
 
+    def _skip(self, node):
+        # leaf nodes (see _LEAF_NODES below): no children, nothing to count
+        pass
 
-# ---------- Metric Calculators ----------
+    def _count_decision(self):
+        if self._method_stack:
+            self._method_stack[-1].decisions += 1
+
+
+# node type -> handler, e.g. ast.ClassDef -> Analyzer.visit_ClassDef
+Analyzer._dispatch = {
+    getattr(ast, name[len('visit_'):]): fn
+    for name, fn in list(vars(Analyzer).items())
+    if name.startswith('visit_')
+}
 
-def cyclomatic_complexity(func_node: ast.FunctionDef) -> int:
-    # CC = 1 + number of decision points inside function
-    counter = 0
-    for node in ast.walk(func_node):
-        if isinstance(node, (ast.If, ast.For, ast.While, ast.Try, ast.With, ast.ExceptHandler, ast.BoolOp)):
-            counter += 1
-        # conditional expressions
-        if isinstance(node, ast.IfExp):
-            counter += 1
-    return max(1, 1 + counter)
+# childless node types no handler inspects directly: constants, load/store
+# contexts and operator tokens; dispatching them to _skip saves a generic_visit each
+_LEAF_NODES = [ast.Constant]
+for _base in (ast.expr_context, ast.boolop, ast.operator, ast.unaryop, ast.cmpop):
+    _LEAF_NODES.extend(_base.__subclasses__())
+Analyzer._dispatch.update(dict.fromkeys(_LEAF_NODES, Analyzer._skip))
 
 
+# ---------- Metric Calculators ----------
+
 def halstead_volume(operators: Counter, operands: Counter):
     N1 = sum(operators.values())
     N2 = sum(operands.values())
@@ -194,46 +375,167 @@ def halstead_volume(operators: Counter, operands: Counter):
 
 # LCOM (Henderson-Sellers/Chidamber-Kemerer style simplified)
 def lcom_of_class(ci: ClassInfo):
-    methods = list(ci.methods.values())
-    m = len(methods)
-    if m <= 1:
-        return 0
-    # collect attributes used by each method: look for 'self.X' in method body
-    method_attrs = []
-    for fn in methods:
-        attrs = set()
-        for node in ast.walk(fn):
-            if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'self':
-                attrs.add(node.attr)
-        method_attrs.append(attrs)
-    P = 0
-    Q = 0
-    for i in range(m):
-        for j in range(i+1, m):
-            if method_attrs[i].isdisjoint(method_attrs[j]):
-                P += 1
-            else:
-                Q += 1
-    lcom = P - Q
-    return lcom if lcom > 0 else 0
+    # attributes used by each method ('self.X' in method body), collected by Analyzer
+    return lcom_from_method_attrs([mi.self_attrs for mi in ci.methods.values()])
 
 
 # DIT & NOC: need whole-project graph
 
+# ---------- Per-file worker ----------
+
+# ast.parse builds its tree recursively, bounded by the interpreter recursion limit
+# (3.11 and older); workers raise it so deeply nested generated code still parses
+PARSE_RECURSION_LIMIT = 10000
+
+
+def _init_worker():
+    if sys.getrecursionlimit() < PARSE_RECURSION_LIMIT:
+        sys.setrecursionlimit(PARSE_RECURSION_LIMIT)
+
+
+_BLANK_LINE = re.compile(rb'\n(?=\n)')
+# a line whose first byte left after _ASCII_BLANKS is not ASCII: it may still be blank
+# or a comment once str.strip() drops non-ASCII whitespace such as U+00A0
+_NON_ASCII_LINE = re.compile(rb'\n[\x80-\xff][^\n]*')
+# the ASCII characters str.strip() removes, \n and \r aside
+_ASCII_BLANKS = b' \t\f\v\x1c\x1d\x1e\x1f'
+
+
+def count_lines(src: bytes):
+    # LOC (non-blank non-comment), comment lines and total lines, counted with
+    # C-level scans over the buffer instead of one bytes object per line
+    if b'\r' in src:
+        # fold \r\n and lone \r into \n so the counts agree with splitlines()
+        src = src.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    if not src:
+        return 0, 0, 0
+    # with the ASCII blanks strip() would remove gone and every line framed by '\n',
+    # a comment line starts with '\n#' and a blank line is an empty '\n\n'
+    buf = b'\n' + src.translate(None, _ASCII_BLANKS)
+    if not src.endswith(b'\n'):
+        buf += b'\n'
+    total = buf.count(b'\n') - 1
+    comments = buf.count(b'\n#')
+    blank = len(_BLANK_LINE.findall(buf))
+    if not src.isascii():
+        # decode just those lines (as UTF-8, the default source encoding) and strip them
+        for m in _NON_ASCII_LINE.finditer(buf):
+            line = m.group()[1:].decode('utf-8', 'replace').strip()
+            if not line:
+                blank += 1
+            elif line.startswith('#'):
+                comments += 1
+    return total - blank - comments, comments, total
+
+
+def _read_source(path):
+    # runs in a reader thread (the blocking read releases the GIL)
+    try:
+        # raw bytes: ast.parse does the decoding (honouring coding cookies)
+        with open(path, 'rb') as f:
+            return path, f.read(), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+def _parse_source(path, src):
+    # parse + analyze one file, reduce it to picklable data
+    # lines are counted even if the file fails to parse below
+    loc, comments, total = count_lines(src)
+    try:
+        tree = ast.parse(src, filename=path, type_comments=False)
+        an = Analyzer(path)
+        an.run(tree)
+    except Exception as e:
+        res = FileResult(path, error=str(e))
+    else:
+        for ci in an.classes.values():
+            ci.wmc = sum(cyclomatic_complexity(mi.decisions) for mi in ci.methods.values())
+            ci.lcom = lcom_of_class(ci)
+        res = FileResult(path, an.classes, an.operators, an.operands)
+    res.loc, res.comment_lines, res.total_lines = loc, comments, total
+    return res
+
+
+def _parse_batch(batch):
+    # runs in a worker process: one task per batch of _read_source results
+    results = []
+    for path, src, error in batch:
+        if error is not None:
+            results.append(FileResult(path, error=error))
+        else:
+            results.append(_parse_source(path, src))
+    return results
+
+
+# ---------- Read / parse pipeline ----------
+
+READ_WORKERS = 8
+READ_AHEAD = 32  # files read but not yet handed to a parser, to cap memory
+# a parser task gets up to BATCH_FILES files or BATCH_BYTES of source, whichever
+# comes first: small files share the IPC round-trip, big ones still spread out
+BATCH_FILES = 64
+BATCH_BYTES = 256 * 1024
+
+
+def _pipelined(executor, fn, items, depth):
+    # like executor.map, but submits lazily with at most `depth` calls in flight;
+    # results come back in input order
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= depth:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _batches(reads):
+    batch = []
+    size = 0
+    for item in reads:
+        batch.append(item)
+        if item[1] is not None:
+            size += len(item[1])
+        if len(batch) >= BATCH_FILES or size >= BATCH_BYTES:
+            yield batch
+            batch = []
+            size = 0
+    if batch:
+        yield batch
+
+
+def _iter_file_results(root):
+    # reader threads overlap disk I/O with the CPU-bound parsing in the process pool;
+    # FileResults are yielded in iter_py_files order
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as parsers:
+        # with the fork start method the first submit forks every worker; do it before
+        # any reader thread exists, as forking a multi-threaded process can deadlock
+        # the child (and warns on 3.12+)
+        parsers.submit(int)
+        with ThreadPoolExecutor(max_workers=READ_WORKERS) as readers:
+            reads = _pipelined(readers, _read_source, iter_py_files(root), READ_AHEAD)
+            for results in _pipelined(parsers, _parse_batch, _batches(reads), 2 * workers):
+                yield from results
+
+
 # ---------- Project-wide aggregator ----------
 
 def analyze_project(root):
-    analyzers = {}
-    for path in iter_py_files(root):
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                src = f.read()
-            tree = ast.parse(src, filename=path)
-            an = Analyzer(path)
-            an.visit(tree)
-            analyzers[path] = an
-        except Exception as e:
-            print(f"Warning: failed to parse {path}: {e}")
+    analyzers = {}  # path -> FileResult
+    # line counts cover every readable file, including ones that fail to parse
+    loc = 0
+    total_lines = 0
+    comment_lines = 0
+    for res in _iter_file_results(root):
+        loc += res.loc
+        total_lines += res.total_lines
+        comment_lines += res.comment_lines
+        if res.error is not None:
+            print(f"Warning: failed to parse {res.filepath}: {res.error}")
+            continue
+        analyzers[res.filepath] = res
 
     # collect classes across project
     classes = {}  # name -> ClassInfo
@@ -248,62 +550,85 @@ def analyze_project(root):
     for key, ci in classes.items():
         name_to_keys[ci.name].append(key)
 
-    # compute DIT (depth within known project inheritance only)
-    def compute_dit(key, visited=None):
-        if visited is None:
-            visited = set()
-        if key in visited:
-            return 0
-        visited.add(key)
-        ci = classes[key]
-        if not ci.bases:
-            return 1
-        max_depth = 1
-        for b in ci.bases:
-            # try resolving base to a key
-            if b in name_to_keys:
-                # pick first match
-                base_key = name_to_keys[b][0]
-                d = 1 + compute_dit(base_key, visited)
-                if d > max_depth:
-                    max_depth = d
-            else:
-                # unknown base, assume external (depth 1)
-                max_depth = max(max_depth, 2)
-        return max_depth
-
-    dit_map = {}
-    for key in classes:
-        dit_map[key] = compute_dit(key)
-
-    # NOC: count immediate subclasses present in project
+    # inheritance graph, resolved once and shared by DIT, NOC, PF and MIF
+    parent_of = {}  # key -> keys of its bases found in the project (first match per name)
+    # NOC: count immediate subclasses present in project (every class with the base's name)
     noc_map = {k: 0 for k in classes}
     for key, ci in classes.items():
+        parents = []
         for b in ci.bases:
             if b in name_to_keys:
+                parents.append(name_to_keys[b][0])
                 for base_key in name_to_keys[b]:
                     noc_map[base_key] += 1
+        parent_of[key] = parents
 
-    # WMC, CBO, RFC, LCOM
-    metrics = {}
+    # compute DIT (depth within known project inheritance only)
+    # one pass of Tarjan's strongly-connected-components algorithm over parent_of: every
+    # group of classes inheriting from each other in a cycle is resolved as a whole, once,
+    # after every group it inherits from, so the pass is linear in classes + bases
+    dit_map = {}
+    order = {}  # key -> DFS visit number
+    low = {}  # key -> lowest visit number reachable through keys still on the path
+    path = []  # visited keys whose group is not resolved yet
+    on_path = set()
+
+    def resolve(key):
+        order[key] = low[key] = len(order)
+        path.append(key)
+        on_path.add(key)
+        for base_key in parent_of[key]:
+            if base_key not in order:
+                resolve(base_key)
+                low[key] = min(low[key], low[base_key])
+            elif base_key in on_path:
+                low[key] = min(low[key], order[base_key])
+        if low[key] != order[key]:
+            return
+        # key is the first-visited member of its group; pop the whole group
+        group = set()
+        while key not in group:
+            k = path.pop()
+            on_path.discard(k)
+            group.add(k)
+        max_depth = 1
+        for k in group:
+            parents = parent_of[k]
+            # any unknown base is assumed external (depth 1), so the class is at least depth 2
+            if len(parents) < len(classes[k].bases):
+                max_depth = max(max_depth, 2)
+            for base_key in parents:
+                if base_key not in group:
+                    max_depth = max(max_depth, 1 + dit_map[base_key])
+        # an inheritance cycle counts as a chain through all of its classes, so every
+        # member gets the same depth whichever class the walk started from
+        depth = max_depth + len(group) - 1
+        for k in group:
+            dit_map[k] = depth
+
+    for key in classes:
+        if key not in order:
+            resolve(key)
+
+    # accumulate halstead tokens from file-level analyzers, once per file
     total_operators = Counter()
     total_operands = Counter()
+    for an in analyzers.values():
+        total_operators.update(an.operators)
+        total_operands.update(an.operands)
+
+    # WMC, CBO, RFC, LCOM
+    metrics = {}
     for key, ci in classes.items():
-        wmc = 0
-        cbo = set()
-        rfc_set = set()
-        for mname, mnode in ci.methods.items():
-            cc = cyclomatic_complexity(mnode)
-            wmc += cc
-            # calls -> called methods
-            # we've stored called_methods and called_classes in Analyzer but Analyzer instance is per-file
+        # WMC (sum of method CC) and LCOM were computed by the worker that parsed the file
+        wmc = ci.wmc
         # compute CBO from Analyzer info: combine called_classes across methods
         # Need to find the Analyzer that had this class
         called_classes = ci.called_classes
         cbo = set(called_classes) - {ci.name}
         # RFC = number of methods + number of distinct methods called
         rfc = len(ci.methods) + len(ci.called_methods)
-        lcom = lcom_of_class(ci)
+        lcom = ci.lcom
         metrics[key] = {
             'WMC': wmc,
             'CBO': len(cbo),
@@ -317,43 +642,16 @@ def analyze_project(root):
             'called_methods': list(ci.called_methods),
             'filepath': ci.filepath,
         }
-        # accumulate halstead tokens from file-level analyzers
-        # find Analyzer for filepath
-        for an in analyzers.values():
-            if an.filepath == ci.filepath:
-                total_operators.update(an.operators)
-                total_operands.update(an.operands)
 
     # Halstead Volume
     V = halstead_volume(total_operators, total_operands)
 
     # MI calculation per file/project (we'll compute a project-level MI)
-    # LOC: count non-empty non-comment lines
-    loc = 0
-    for path in iter_py_files(root):
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    s = line.strip()
-                    if s and not s.startswith('#'):
-                        loc += 1
-        except Exception:
-            pass
+    # LOC, total and comment lines were counted by the workers (see count_lines)
 
     # Cyclomatic complexity project-level: sum of WMCs
     total_cc = sum(m['WMC'] for m in metrics.values())
     # Comment percentage (approx): comments / total lines
-    total_lines = 0
-    comment_lines = 0
-    for path in iter_py_files(root):
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    total_lines += 1
-                    if line.strip().startswith('#'):
-                        comment_lines += 1
-        except Exception:
-            pass
     comment_pct = 0
     if total_lines:
         comment_pct = (comment_lines / total_lines) * 100
@@ -368,35 +666,25 @@ def analyze_project(root):
             MI = 0.0
 
     # Polymorphism Factor (PF): fraction of overridden methods among possible overrides
+    # Method Inheritance Factor (MIF): ratio of inherited methods to total methods available
     overridden = 0
     total_methods = 0
-    for key, ci in classes.items():
-        total_methods += len(ci.methods)
-        # check if a method overrides a base method
-        for b in ci.bases:
-            if b in name_to_keys:
-                base_key = name_to_keys[b][0]
-                base_ci = classes.get(base_key)
-                if base_ci:
-                    for m in ci.methods:
-                        if m in base_ci.methods:
-                            overridden += 1
-    PF = (overridden / total_methods) if total_methods else 0.0
-
-    # Method Inheritance Factor (MIF): ratio of inherited methods to total methods available
     inherited_methods = 0
     available_methods = 0
     for key, ci in classes.items():
         own = len(ci.methods)
+        total_methods += own
         inherited = 0
-        for b in ci.bases:
-            if b in name_to_keys:
-                base_key = name_to_keys[b][0]
-                base_ci = classes.get(base_key)
-                if base_ci:
-                    inherited += len(base_ci.methods)
+        for base_key in parent_of[key]:
+            base_methods = classes[base_key].methods
+            inherited += len(base_methods)
+            # check if a method overrides a base method
+            for m in ci.methods:
+                if m in base_methods:
+                    overridden += 1
         inherited_methods += inherited
         available_methods += own + inherited
+    PF = (overridden / total_methods) if total_methods else 0.0
     MIF = (inherited_methods / available_methods) if available_methods else 0.0
 
     return metrics, {
@@ -413,19 +701,25 @@ def analyze_project(root):
 # ---------- CLI ----------
 
 def print_report(metrics, summary):
-    print('\nObject-Oriented Metrics Report')
-    print('-------------------------------------')
-    print(f"Project Maintainability Index (MI): {summary['MI']:.2f}")
-    print(f"Halstead Volume (approx): {summary['Halstead_Volume']:.2f}")
-    print(f"Total Cyclomatic Complexity: {summary['Total_CC']}")
-    print(f"LOC (approx, non-blank non-comment): {summary['LOC']}")
-    print(f"Polymorphism Factor (PF): {summary['PF']:.3f}")
-    print(f"Method Inheritance Factor (MIF): {summary['MIF']:.3f}")
-    print('\nClass-level metrics:')
-    print('{:40} {:>5} {:>5} {:>5} {:>5} {:>5} {:>5}'.format('Class@file', 'WMC', 'DIT', 'NOC', 'CBO', 'RFC', 'LCOM'))
+    # build the whole report first and emit it with a single write
+    lines = [
+        '',
+        'Object-Oriented Metrics Report',
+        '-------------------------------------',
+        f"Project Maintainability Index (MI): {summary['MI']:.2f}",
+        f"Halstead Volume (approx): {summary['Halstead_Volume']:.2f}",
+        f"Total Cyclomatic Complexity: {summary['Total_CC']}",
+        f"LOC (approx, non-blank non-comment): {summary['LOC']}",
+        f"Polymorphism Factor (PF): {summary['PF']:.3f}",
+        f"Method Inheritance Factor (MIF): {summary['MIF']:.3f}",
+        '',
+        'Class-level metrics:',
+        f"{'Class@file':40} {'WMC':>5} {'DIT':>5} {'NOC':>5} {'CBO':>5} {'RFC':>5} {'LCOM':>5}",
+    ]
     for key, m in metrics.items():
-        short = f"{key}" if len(key) < 38 else (key[:34] + '...')
-        print('{:40} {:5} {:5} {:5} {:5} {:5} {:5}'.format(short, m['WMC'], m['DIT'], m['NOC'], m['CBO'], m['RFC'], m['LCOM']))
+        short = key if len(key) < 38 else (key[:34] + '...')
+        lines.append(f"{short:40} {m['WMC']:5} {m['DIT']:5} {m['NOC']:5} {m['CBO']:5} {m['RFC']:5} {m['LCOM']:5}")
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 
 if __name__ == '__main__':
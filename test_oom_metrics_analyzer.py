@@ -0,0 +1,142 @@
+"""
+Regression tests for oom_metrics_analyzer.py
+
+Usage:
+    python -m unittest test_oom_metrics_analyzer
+
+"""
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+import unittest
+
+from oom_metrics_analyzer import analyze_project, count_lines
+
+
+def _write(root, relpath, text):
+    path = os.path.join(root, relpath)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def _analyze(root):
+    # analyze_project prints a warning per unparsable file; keep test output clean
+    with contextlib.redirect_stdout(io.StringIO()):
+        metrics, _ = analyze_project(root)
+    return {key.split('@')[0]: m for key, m in metrics.items()}
+
+
+def _reference_dit(parents, n_bases):
+    # brute force over the same definition analyze_project uses: classes that are
+    # mutually reachable through their bases form one group, and a group of n classes
+    # counts as a chain of n, continued by the deepest base outside the group
+    def reach(start):
+        seen = set()
+        todo = list(parents[start])
+        while todo:
+            c = todo.pop()
+            if c not in seen:
+                seen.add(c)
+                todo.extend(parents[c])
+        return seen
+
+    reachable = {c: reach(c) for c in parents}
+    group = {c: {c} | {o for o in reachable[c] if c in reachable[o]} for c in parents}
+
+    def dit(c):
+        depth = 1
+        for m in group[c]:
+            if len(parents[m]) < n_bases[m]:
+                depth = max(depth, 2)
+            for p in parents[m]:
+                if p not in group[c]:
+                    depth = max(depth, 1 + dit(p))
+        return depth + len(group[c]) - 1
+
+    return {c: dit(c) for c in parents}
+
+
+class DITTest(unittest.TestCase):
+
+    def test_cross_file_cycle(self):
+        # each class of the cycle has a base inside the project, so neither is depth 1,
+        # whichever file is resolved first
+        with tempfile.TemporaryDirectory() as root:
+            _write(root, 'a/cyc1.py', 'class A(B):\n    pass\n')
+            _write(root, 'b/cyc2.py', 'class B(A):\n    pass\n')
+            metrics = _analyze(root)
+        self.assertEqual(metrics['A']['DIT'], 2)
+        self.assertEqual(metrics['B']['DIT'], 2)
+
+    def test_diamond(self):
+        with tempfile.TemporaryDirectory() as root:
+            _write(root, 'm.py', 'class A: pass\nclass B(A): pass\nclass C(A): pass\n'
+                                 'class D(B, C): pass\n')
+            metrics = _analyze(root)
+        self.assertEqual([metrics[c]['DIT'] for c in 'ABCD'], [1, 2, 2, 3])
+
+    def test_random_hierarchies_match_brute_force(self):
+        rng = random.Random(0)
+        for _ in range(40):
+            n = rng.randint(1, 7)
+            names = [f'C{i}' for i in range(n)]
+            bases = {c: rng.sample(names + ['External'], rng.randint(0, min(3, n + 1)))
+                     for c in names}
+            with tempfile.TemporaryDirectory() as root:
+                for i, c in enumerate(names):
+                    _write(root, f'f{i}.py', f"class {c}({', '.join(bases[c])}):\n    pass\n")
+                metrics = _analyze(root)
+            parents = {c: [b for b in bases[c] if b in bases] for c in names}
+            expected = _reference_dit(parents, {c: len(bases[c]) for c in names})
+            got = {c: metrics[c]['DIT'] for c in names}
+            self.assertEqual(got, expected, bases)
+
+    def test_dense_cycle_is_resolved_once(self):
+        # every class inherits from all the others: walking each simple path through the
+        # group is factorial in its size, resolving the group once is not
+        names = [f'C{i}' for i in range(11)]
+        with tempfile.TemporaryDirectory() as root:
+            for c in names:
+                others = ', '.join(o for o in names if o != c)
+                _write(root, f'{c.lower()}.py', f'class {c}({others}):\n    pass\n')
+            start = time.perf_counter()
+            metrics = _analyze(root)
+            elapsed = time.perf_counter() - start
+        self.assertEqual({metrics[c]['DIT'] for c in names}, {11})
+        self.assertLess(elapsed, 30)
+
+
+class LineCountTest(unittest.TestCase):
+
+    def _strip_loop(self, src):
+        # the original per-line count: text-mode lines, str.strip()
+        loc = comments = total = 0
+        for line in io.TextIOWrapper(io.BytesIO(src), encoding='utf-8'):
+            total += 1
+            s = line.strip()
+            if s.startswith('#'):
+                comments += 1
+            elif s:
+                loc += 1
+        return loc, comments, total
+
+    def test_unicode_whitespace_lines_are_blank(self):
+        # \x1c and U+00A0 (non-breaking space) are whitespace to str.strip()
+        src = b'x = 1\n\x0c\n# c\x1c\ny = 2\n\xc2\xa0\n\x1c\n'
+        self.assertEqual(count_lines(src), (2, 1, 6))
+
+    def test_matches_strip_loop(self):
+        rng = random.Random(0)
+        alphabet = ['a', '#', ' ', '\t', '\n', '\r', '\x0b', '\x0c', '\x1c', '\x1f',
+                    '\x85', '\xa0', '\u2003', '\u3000', '\u00e9', '\ufeff', '\u200b']
+        for _ in range(5000):
+            src = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))).encode()
+            self.assertEqual(count_lines(src), self._strip_loop(src), src)
+
+
+if __name__ == '__main__':
+    unittest.main()